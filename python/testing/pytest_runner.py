@@ -1,63 +1,271 @@
+import ast
+import asyncio
+import hashlib
+import importlib.util
+import logging
+import orjson
 import os
+import pickle
 import pytest
-
-from datetime import datetime, timezone
-from multiprocessing import Process, Manager, Queue
+import re
+import signal
+import subprocess
+import sys
+import sysconfig
+import tempfile
+import time
+
+from contextlib import contextmanager
+from fnmatch import fnmatch
+from multiprocessing import Pipe, Process, Queue
+from multiprocessing.connection import Connection
+from multiprocessing.util import Finalize
 from pathlib import Path
-from threading import Thread
-from typing import Callable, List
+from threading import Event, Lock, Thread
+from typing import Callable, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+DISCOVERY_CACHE_DIR = Path.home() / '.cache' / 'nxs-python'
+
+# Pytest configuration files outside the test directory that influence the collection
+PYTEST_CONFIG_FILES = ('conftest.py', 'pytest.ini', 'pyproject.toml', 'tox.ini', 'setup.cfg')
+
+# Directories skipped by pytest by default, its norecursedirs setting
+NORECURSE_DIRS = ('*.egg', '.*', '_darcs', 'build', 'CVS', 'dist', 'node_modules', 'venv', '{arch}')
+
+# Test files and names as matched by pytest's default python_files, python_classes and python_functions
+TEST_FILE_PATTERN = re.compile(r'^(test_.*|.*_test)\.py$')
+TEST_CLASS_PREFIX = 'Test'
+TEST_FUNCTION_PREFIX = 'test'
+
+# Progress messages are sent in batches of at most this size, or after this many seconds
+MESSAGE_BATCH_SIZE = 16
+MESSAGE_FLUSH_INTERVAL = 0.02
+
+# Only the tail of the captured stdout and stderr of a test is sent along with its result
+MAX_CAPTURED_OUTPUT = 4096
+
+# Exit priority of the finalizer stopping the test worker process, see PytestRunner._start_worker,
+# and the number of seconds the worker gets to finish the current test run before it is terminated
+WORKER_EXIT_PRIORITY = 20
+WORKER_STOP_TIMEOUT = 10
+
+# Niceness increment of the test worker process, relative to the UI process
+WORKER_NICENESS = 5
+
+# Modules loaded from these paths are not reloaded between the sessions in the test worker process
+INSTALLED_MODULE_PATHS = tuple({sysconfig.get_paths()[name] for name in ('stdlib', 'platstdlib', 'purelib', 'platlib')})
 
 
-def run_discovery(test_directory: str, shared_list):
+def _discovery_cache_key(test_dir: Path) -> str:
     """
-    Target function for test discovery to be executed in a separate process.
+    Build a key that changes whenever a file that can influence the test collection changes.
 
     Args:
-        test_directory (str): Directory to search for tests.
-        shared_list (ListProxy): A multiprocessing.Manager list to store test cases.
+        test_dir (Path): Directory containing the tests.
+
+    Returns:
+        str: Hex digest of the paths and modification times of all relevant files.
     """
-    class CollectionPlugin:
-        """
-        A pytest plugin for collecting test cases during discovery.
-        """
-        def __init__(self, collected_tests):
-            self.collected_tests = collected_tests
+    stats = []
+    directories = [str(test_dir)]
+    while directories:
+        try:
+            with os.scandir(directories.pop()) as entries:
+                for entry in entries:
+                    # Skip caches and hidden directories, pytest itself writes to those during collection
+                    if entry.name.startswith('.') or entry.name == '__pycache__':
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        directories.append(entry.path)
+                    else:
+                        stats.append((entry.path, entry.stat(follow_symlinks=False).st_mtime_ns))
+        except OSError:  # Unreadable directory or an entry that disappeared, pytest can't collect those either
+            continue
+
+    # The conftest.py and ini files of the parent directories are also picked up by pytest
+    for parent in test_dir.parents:
+        for config_file in PYTEST_CONFIG_FILES:
+            config_path = parent / config_file
+            if config_path.is_file():
+                stats.append((str(config_path), config_path.stat().st_mtime_ns))
+
+    return hashlib.sha256(repr(sorted(stats)).encode()).hexdigest()
+
+
+@contextmanager
+def _unload_new_modules():
+    """
+    Remove the modules imported within the context from sys.modules again on exit, except for the
+    ones from the standard library and the installed packages, which can stay loaded.
+
+    Used by the test worker process, which is reused, so that modified test files and conftests are
+    re-imported by the next pytest session instead of the stale modules being used.
+    """
+    loaded_modules = set(sys.modules)
+    try:
+        yield
+    finally:
+        for module_name in set(sys.modules) - loaded_modules:
+            module_file = getattr(sys.modules[module_name], '__file__', None)
+            if module_file is None or not module_file.startswith(INSTALLED_MODULE_PATHS):
+                del sys.modules[module_name]
+
+
+@contextmanager
+def _updated_environ(env_fields: dict):
+    """
+    Update os.environ with the given fields within the context and restore the original environment
+    on exit, so the fields of one test run don't leak into the next one in the reused worker process.
+
+    Args:
+        env_fields (dict): Environment variables to set.
+    """
+    saved_environ = os.environ.copy()
+    os.environ.update(env_fields)
+    try:
+        yield
+    finally:
+        os.environ.clear()
+        os.environ.update(saved_environ)
 
-        def pytest_collectreport(self, report):
-            if report.outcome == 'passed':
-                for test in report.result:
-                    self.collected_tests.append(test.nodeid)
 
+def _find_tests_in_file(test_file: str) -> List[str]:
+    """
+    Find the test functions and the test methods of the test classes in a test file by parsing it,
+    without importing it.
+
+    Args:
+        test_file (str): Path of the test file.
+
+    Returns:
+        List[str]: The test names in pytest-compatible format, e.g. ['test_function', 'TestClass::test_method'].
+    """
+    with open(test_file, 'rb') as f:
+        tree = ast.parse(f.read(), filename=test_file)
+
+    function_types = (ast.FunctionDef, ast.AsyncFunctionDef)
+    test_names = []
+    for node in tree.body:
+        if isinstance(node, function_types) and node.name.startswith(TEST_FUNCTION_PREFIX):
+            test_names.append(node.name)
+        elif isinstance(node, ast.ClassDef) and node.name.startswith(TEST_CLASS_PREFIX):
+            # Like pytest, skip classes with a constructor
+            if any(isinstance(item, function_types) and item.name == '__init__' for item in node.body):
+                continue
+            test_names.extend(f'{node.name}::{item.name}' for item in node.body
+                              if isinstance(item, function_types) and item.name.startswith(TEST_FUNCTION_PREFIX))
+
+    return test_names
+
+
+def run_discovery(test_directory: str) -> Optional[List[str]]:
+    """
+    Discover the test cases by running pytest --collect-only in a subprocess and parsing its output.
+
+    Args:
+        test_directory (str): Directory to search for tests.
+
+    Returns:
+        List[str]: The discovered test cases, None when the directory is invalid or the collection fails.
+    """
     test_dir = Path(test_directory)
     if not test_dir.is_dir():
-        return  # Invalid directory; no tests discovered
+        return None  # Invalid directory; no tests discovered
 
-    pytest_args = [str(test_dir), '--collect-only', '-q']
+    # Set the verbosity instead of using -q, which would add to a -q in the addopts of the project and
+    # then only print the number of tests per file. The rootdir makes the ids relative to the test
+    # directory, the same as discover_tests_fast, and the cache isn't needed for the collection.
+    pytest_args = [str(test_dir), '--collect-only', '--verbosity=-1', f'--rootdir={test_dir}', '-p', 'no:cacheprovider']
+    result = subprocess.run([sys.executable, '-m', 'pytest'] + pytest_args, capture_output=True, text=True)
+    if result.returncode not in (pytest.ExitCode.OK, pytest.ExitCode.NO_TESTS_COLLECTED):
+        return None
+
+    # At this verbosity the test ids are printed one per line, followed by an empty line and the summary
     collected_tests = []
-    result = pytest.main(pytest_args, plugins=[CollectionPlugin(collected_tests)])
-    if result == 0:
-        # Filter only individual test functions (exclude modules and directories)
-        shared_list.extend([test for test in collected_tests if "::" in test])
+    for line in result.stdout.splitlines():
+        if not line:
+            break
+        # Only keep individual test functions (exclude modules and directories)
+        if '::' in line:
+            collected_tests.append(line)
+
+    return collected_tests
 
 
-def run_pytest(test_cases: List[str], extra_pytest_args: List[str], env_fields: dict, queue: Queue):
+def run_pytest(test_cases: List[str], extra_pytest_args: List[str], env_fields: dict, connection: Connection, capture_output: bool = True):
     """
     Run pytest with a custom plugin for progress tracking.
-    Messages are sent to the provided queue.
+    Messages are sent over the provided connection in orjson encoded lists of up to MESSAGE_BATCH_SIZE
+    messages, followed by an encoded None once pytest has finished. When capture_output is set the completed
+    messages include the last MAX_CAPTURED_OUTPUT characters of the test's stdout and stderr.
     """
     class ProgressPlugin:
         def __init__(self):
             self.current_index = 0
             self.total_tests = 0
+            self._outbox = []
+            self._outbox_lock = Lock()
+            self._session_finished = Event()
+            self._flush_thread = Thread(target=self._flush_periodically, daemon=True)
+            self._rootpath = None
+            self._resolved_files = {}
+
+        def _send(self, message):
+            with self._outbox_lock:
+                self._outbox.append(message)
+                if len(self._outbox) >= MESSAGE_BATCH_SIZE:
+                    self._flush()
+
+        def _flush(self):
+            # Needs to be called with the outbox lock held. Blocks while the pipe is full, so the test run
+            # can't get ahead of the monitor thread by more than the pipe's buffer.
+            if self._outbox:
+                connection.send_bytes(orjson.dumps(self._outbox))
+                self._outbox = []
+
+        def _flush_periodically(self):
+            # Make sure a partial batch doesn't wait for a slow test to finish
+            while not self._session_finished.wait(MESSAGE_FLUSH_INTERVAL):
+                with self._outbox_lock:
+                    self._flush()
+
+        def _test_path(self, nodeid):
+            # The node ids are relative to the rootdir, which depends on the pytest configuration and the
+            # arguments. Report the test with its resolved absolute path as well, so it can be recognised.
+            test_file, separator, test_name = nodeid.partition('::')
+            if test_file not in self._resolved_files:
+                self._resolved_files[test_file] = str((self._rootpath / test_file).resolve())
+            return f'{self._resolved_files[test_file]}{separator}{test_name}'
+
+        def pytest_sessionstart(self, session):
+            self._rootpath = session.config.rootpath
+            self._flush_thread.start()
+
+        def pytest_sessionfinish(self, session, exitstatus):
+            self._session_finished.set()
+            self._flush_thread.join()
+            with self._outbox_lock:
+                self._flush()
 
         def pytest_collection_modifyitems(self, items):
             self.total_tests = len(items)
 
-        def pytest_runtest_protocol(self, item, nextitem):
+        @pytest.hookimpl(optionalhook=True)
+        def pytest_xdist_node_collection_finished(self, node, ids):
+            # With pytest-xdist the collection is done by the workers, all of them collect the same tests
+            self.total_tests = len(ids)
+
+        # The logstart and logreport hooks are also called on the pytest-xdist controller,
+        # unlike pytest_runtest_protocol, which is only called on the workers
+        def pytest_runtest_logstart(self, nodeid, location):
             self.current_index += 1
-            queue.put({
-                'timestamp': datetime.now(timezone.utc).isoformat(),
-                'test_name': item.nodeid,
+            self._send({
+                'ts_ns': time.time_ns(),
+                'test_name': nodeid,
+                'test_path': self._test_path(nodeid),
                 'current_index': self.current_index,
                 'total_tests': self.total_tests,
                 'reason': 'running',
@@ -65,83 +273,329 @@ def run_pytest(test_cases: List[str], extra_pytest_args: List[str], env_fields:
 
         def pytest_runtest_logreport(self, report):
             if report.when == 'call':
-                queue.put({
-                    'timestamp': datetime.now(timezone.utc).isoformat(),
+                message = {
+                    'ts_ns': time.time_ns(),
                     'test_name': report.nodeid,
+                    'test_path': self._test_path(report.nodeid),
                     'outcome': report.outcome,
                     'duration': report.duration,
-                    'stdout': report.capstdout,
-                    'stderr': report.capstderr,
                     'reason': 'completed',
-                })
+                }
+                if capture_output:
+                    message['stdout'] = (report.capstdout or '')[-MAX_CAPTURED_OUTPUT:]
+                    message['stderr'] = (report.capstderr or '')[-MAX_CAPTURED_OUTPUT:]
+                self._send(message)
 
-    os.environ.update(env_fields)
     pytest_args = ['-s', '--capture=tee-sys'] + extra_pytest_args + test_cases
-    pytest.main(pytest_args, plugins=[ProgressPlugin()])
+    try:
+        with _updated_environ(env_fields), _unload_new_modules():
+            pytest.main(pytest_args, plugins=[ProgressPlugin()])
+    finally:
+        connection.send_bytes(orjson.dumps(None))  # Signal the end of the run to the monitor thread
+
+
+def run_pytest_worker(job_queue: Queue, message_connection: Connection):
+    """
+    Target function for the test worker process, which is kept alive between test runs so that
+    Python, pytest and its plugins only need to be imported once.
+
+    Runs run_pytest for every (test_cases, extra_pytest_args, env_fields, capture_output) job
+    received on the job queue, until None is received.
+    """
+    # Start a new process group, so that stopping the worker also stops the processes started by the tests,
+    # like the pytest-xdist workers
+    if hasattr(os, 'setsid'):
+        os.setsid()
+
+    # Keep the tests off the first CPU and at a lower priority, so they don't make the UI stutter
+    if hasattr(os, 'sched_setaffinity'):
+        cpus = os.sched_getaffinity(0) - {0}
+        if cpus:
+            os.sched_setaffinity(0, cpus)
+    if hasattr(os, 'nice'):
+        os.nice(WORKER_NICENESS)
+
+    while True:
+        job = job_queue.get()
+        if job is None:
+            break
+        test_cases, extra_pytest_args, env_fields, capture_output = job
+        run_pytest(test_cases, extra_pytest_args, env_fields, message_connection, capture_output)
+
+
+def _terminate_worker_process(worker_process: Process):
+    """
+    Terminate the test worker process, together with the processes in its process group on POSIX.
+
+    Args:
+        worker_process (Process): The worker process.
+    """
+    if hasattr(os, 'killpg'):
+        try:
+            os.killpg(worker_process.pid, signal.SIGTERM)
+        except ProcessLookupError:  # The worker and its processes have already exited
+            pass
+    else:
+        worker_process.terminate()
+
+
+def _stop_worker_process(job_queue: Queue, worker_process: Process):
+    """
+    Stop the test worker process after it has finished the current test run, or terminate it when
+    that takes longer than WORKER_STOP_TIMEOUT. Nothing may be reading its messages anymore at this
+    point, in which case it would otherwise block forever once the message pipe is full.
+
+    Args:
+        job_queue (Queue): The job queue of the worker process.
+        worker_process (Process): The worker process.
+    """
+    if worker_process.is_alive():
+        job_queue.put(None)
+        worker_process.join(WORKER_STOP_TIMEOUT)
+        if worker_process.is_alive():
+            _terminate_worker_process(worker_process)
+            worker_process.join()
 
 
 class PytestRunner:
-    def __init__(self, callback: Callable[[dict], None]):
+    def __init__(self, callback: Callable[[dict], None], capture_output: bool = True, parallel: int = 0,
+                 loop: asyncio.AbstractEventLoop = None):
         """
         Initializes the PytestRunner.
 
         Args:
             callback (Callable): A function to report the test being executed,
-                its index, and the total number of tests.
+                its index, and the total number of tests. The messages are timestamped
+                with 'ts_ns', the time.time_ns() at which they were created.
                 Signature: callback(message: dict)
+            capture_output (bool, optional): Include the tail of the captured stdout and stderr
+                in the completed messages. Defaults to True.
+            parallel (int, optional): Number of pytest-xdist workers to distribute the tests over,
+                e.g. os.cpu_count(). The tests of a module are run by the same worker. Ignored when
+                pytest-xdist isn't installed. Defaults to 0, running the tests one by one.
+            loop (asyncio.AbstractEventLoop, optional): Event loop to invoke the callback in, e.g. the
+                loop of the UI. Defaults to None, using the loop start_tests is called from, if any,
+                and otherwise invoking the callback from the thread monitoring the test run.
         """
         self.callback = callback
-        self._running_process = None
-        self._message_queue = None
+        self.capture_output = capture_output
+        self.parallel = parallel if importlib.util.find_spec('xdist') else 0
+        self.loop = loop
+        self._callback_loop = None
+        self._worker_process = None
+        self._job_queue = None
+        self._message_connection = None
+        self._running = False
+        self._stopping = False
+        self._worker_lock = Lock()
         self._monitor_thread = None
+        self._worker_finalizer = None
         self.initialized = True
 
     def discover_tests(self, test_directory: str):
         """
         Discovers all test cases in the given directory in a separate process.
 
+        The result is cached in DISCOVERY_CACHE_DIR and reused as long as none of the files in the
+        test directory, nor the pytest configuration files in its parents, have been modified.
+
         Args:
             test_directory (str): Path to the directory containing test files.
 
         Returns:
-            List[str]: List of test paths in pytest-compatible format.
+            List[str]: List of test paths, relative to the test directory, in pytest-compatible format.
         """
-        # Use multiprocessing.Manager to share data between processes
-        with Manager() as manager:
-            shared_list = manager.list()
-            discovery_process = Process(target=run_discovery, args=(test_directory, shared_list))
-            discovery_process.start()
-            discovery_process.join()  # Wait for the process to finish
+        test_dir = Path(test_directory).resolve()
+        cache_key = None
+        cache_file = None
+        if test_dir.is_dir():
+            cache_key = _discovery_cache_key(test_dir)
+            cache_file = DISCOVERY_CACHE_DIR / f'discovery-{hashlib.sha256(str(test_dir).encode()).hexdigest()[:16]}.pkl'
+            try:
+                with open(cache_file, 'rb') as f:
+                    stored_key, stored_tests = pickle.load(f)
+                if stored_key == cache_key:
+                    return stored_tests
+            except Exception:  # Missing or corrupt cache file, fall back to the discovery
+                pass
+
+        discovered_tests = run_discovery(test_directory)
+        if discovered_tests is None:
+            return []  # Not cached, the failure may be resolved without any of the test files changing
 
-            # Convert shared_list back to a regular list
-            discovered_tests = list(shared_list)
+        if cache_file:
+            try:
+                # Write to a temporary file first so a concurrent reader never sees a partial file
+                cache_file.parent.mkdir(parents=True, exist_ok=True)
+                with tempfile.NamedTemporaryFile('wb', dir=cache_file.parent, delete=False) as f:
+                    pickle.dump((cache_key, discovered_tests), f)
+                os.replace(f.name, cache_file)
+            except OSError:  # Caching is best effort only
+                pass
 
         return discovered_tests
 
-    def _process_queue(self):
+    def discover_tests_fast(self, test_directory: str):
         """
-        Process messages from the queue and invoke the callback.
-        Terminates when the running process finishes.
+        Discovers the test cases in the given directory by parsing the test files, instead of running
+        the pytest collection. Much faster, but only finds the tests matching pytest's default naming
+        and norecursedirs, not the ones generated by plugins or affected by the pytest configuration.
+        Parametrized tests are returned once, without their parameters.
+
+        Args:
+            test_directory (str): Path to the directory containing test files.
+
+        Returns:
+            List[str]: List of test paths, relative to the test directory, in pytest-compatible format.
         """
-        while self._running_process.is_alive() or not self._message_queue.empty():
+        test_dir = Path(test_directory)
+        if not test_dir.is_dir():
+            return []  # Invalid directory; no tests discovered
+
+        discovered_tests = []
+
+        # Symlinked directories are followed like pytest does, so the directories being scanned are
+        # tracked by inode to stop at a symlink back to one of them
+        scanned_directories = set()
+
+        def scan_directory(directory: str):
             try:
-                message = self._message_queue.get(timeout=0.5)  # Adjust timeout if needed
-                self.callback(message)
-            except Exception:  # Handle queue timeout or unexpected exceptions
-                pass
+                directory_stat = os.stat(directory)
+                directory_id = (directory_stat.st_dev, directory_stat.st_ino)
+                if directory_id in scanned_directories:
+                    return
+
+                # Visit the files and subdirectories in alphabetical order, the same as pytest
+                with os.scandir(directory) as entries:
+                    sorted_entries = sorted(entries, key=lambda entry: entry.name)
+            except OSError:  # Unreadable directory, pytest can't collect it either
+                return
+
+            scanned_directories.add(directory_id)
+            for entry in sorted_entries:
+                if entry.name == '__pycache__':
+                    continue
+                if entry.is_dir():
+                    # Like pytest, also skip virtual environments whatever their name
+                    if any(fnmatch(entry.name, pattern) for pattern in NORECURSE_DIRS) or \
+                            os.path.isfile(os.path.join(entry.path, 'pyvenv.cfg')):
+                        continue
+                    scan_directory(entry.path)
+                elif TEST_FILE_PATTERN.match(entry.name):
+                    try:
+                        test_names = _find_tests_in_file(entry.path)
+                    except (OSError, SyntaxError, ValueError):  # Left for pytest to report when the tests are run
+                        continue
+                    relative_path = Path(entry.path).relative_to(test_dir).as_posix()
+                    discovered_tests.extend(f'{relative_path}::{test_name}' for test_name in test_names)
+            scanned_directories.remove(directory_id)
+
+        scan_directory(str(test_dir))
+
+        return discovered_tests
 
-        # Ensure all remaining messages are processed
-        while not self._message_queue.empty():
-            message = self._message_queue.get_nowait()
+    def _process_messages(self):
+        """
+        Process the batches of messages from the worker process and invoke the callback for each message.
+        Terminates when the None sentinel is received at the end of the test run, which is passed on
+        to the callback as a finished message, or when the worker process has stopped, which is reported
+        as an error unless it was stopped by stop_tests. In that case the cancelled message is passed to
+        the callback after all the messages of the test run.
+        """
+        while True:
+            try:
+                messages = orjson.loads(self._message_connection.recv_bytes())
+            except (EOFError, OSError):  # The worker process stopped, possibly in the middle of a message
+                worker_stopped = True
+                break
+            if messages is None:
+                worker_stopped = False
+                break
+            self._invoke_callbacks(messages)
+
+        with self._worker_lock:
+            if self._stopping:
+                message = {'ts_ns': time.time_ns(), 'reason': 'cancelled'}
+            elif worker_stopped:
+                message = {'ts_ns': time.time_ns(), 'reason': 'error', 'stderror': 'The test process stopped unexpectedly.'}
+            else:
+                message = {'ts_ns': time.time_ns(), 'reason': 'finished'}
+            if self._stopping or worker_stopped:
+                # Wait for it to exit completely, so the next test run starts a new one
+                self._worker_finalizer.cancel()
+                self._worker_process.join()
+                self._worker_process = None
+            # The test run is over, so the callback may already start the next one
+            self._running = False
+        self._invoke_callback(message)
+
+    def _invoke_callbacks(self, messages: List[dict]):
+        """
+        Invoke the callback for each of the messages, in the event loop of the test run when there is one.
+        Returns once all of them have been handled, so the test run blocks on the message pipe when the
+        callbacks can't keep up, instead of the messages piling up in the event loop.
+        """
+        def invoke_callbacks():
+            try:
+                for message in messages:
+                    self._call_callback(message)
+            finally:
+                handled.set()
+
+        if self._callback_loop and not self._callback_loop.is_closed():
+            handled = Event()
+            self._callback_loop.call_soon_threadsafe(invoke_callbacks)
+            handled.wait()
+        else:
+            for message in messages:
+                self._call_callback(message)
+
+    def _invoke_callback(self, message: dict):
+        """
+        Invoke the callback with the message, in the event loop of the test run when there is one.
+        """
+        if self._callback_loop and not self._callback_loop.is_closed():
+            self._callback_loop.call_soon_threadsafe(self._call_callback, message)
+        else:
+            self._call_callback(message)
+
+    def _call_callback(self, message: dict):
+        """
+        Call the callback with the message. An exception raised by it is logged instead of stopping
+        the monitor thread, which has to keep draining the message pipe until the end of the test run.
+        """
+        try:
             self.callback(message)
+        except Exception:
+            logger.exception(f"Callback failed for the {message.get('reason')} message")
+
+    def _start_worker(self):
+        """
+        Start the worker process running the tests, together with the job queue and message pipe to
+        communicate with it.
+        """
+        self._job_queue = Queue()
+        self._message_connection, message_connection = Pipe(duplex=False)
+        self._worker_process = Process(target=run_pytest_worker, args=(self._job_queue, message_connection))
+        self._worker_process.start()
+        # Only the worker process may hold the sending end, so the monitor thread sees EOF when it stops
+        message_connection.close()
+
+        # The worker isn't a daemon, so the tests can use multiprocessing themselves. That means it has to be
+        # told to stop before multiprocessing joins its non-daemon children on exit, which a finalizer with an
+        # exit priority does. It also stops the worker when this runner is garbage collected. The priority
+        # needs to be above the 10 of the queue finalizer that stops its feeder thread, otherwise the
+        # sentinel for the worker may never be sent.
+        self._worker_finalizer = Finalize(self, _stop_worker_process, args=(self._job_queue, self._worker_process),
+                                          exitpriority=WORKER_EXIT_PRIORITY)
 
     def start_tests(self, test_cases: List[str], env_fields: dict = None, extra_pytest_args: List[str] = None):
         """
-        Start running the provided test cases in a separate process and handle messages in a thread.
+        Start running the provided test cases in the worker process and handle messages in a thread.
 
-        This method initializes a multiprocessing process to execute pytest with the provided test cases.
-        A separate thread monitors a message queue for test progress updates and passes them to the callback
-        function. The thread stops automatically when the test process completes.
+        The worker process is started on the first call and reused for the following test runs.
+        A separate thread monitors the message pipe for test progress updates and passes them to the callback
+        function. The thread stops automatically when the test run completes.
 
         Args:
             test_cases (List[str]): A list of pytest-compatible test case identifiers to run.
@@ -154,31 +608,43 @@ class PytestRunner:
         Raises:
             RuntimeError: If tests are already running when this function is called.
         """
-        if self._running_process and self._running_process.is_alive():
+        if self._running:
             raise RuntimeError('Tests are already running.')
 
         extra_pytest_args = extra_pytest_args or []
         env_fields = env_fields or {}
+        if self.parallel:
+            extra_pytest_args = ['-n', str(self.parallel), '--dist=loadfile'] + extra_pytest_args
 
-        self._message_queue = Queue()
-        self._running_process = Process(
-            target=run_pytest,
-            args=(test_cases, extra_pytest_args, env_fields, self._message_queue),
-        )
-        self._running_process.start()
+        self._callback_loop = self.loop
+        if self._callback_loop is None:
+            try:
+                self._callback_loop = asyncio.get_running_loop()
+            except RuntimeError:  # Not called from an event loop
+                pass
+
+        if not (self._worker_process and self._worker_process.is_alive()):
+            self._start_worker()
+        self._job_queue.put((test_cases, extra_pytest_args, env_fields, self.capture_output))
 
-        # Start a thread to monitor the queue
-        self._monitor_thread = Thread(target=self._process_queue)
+        # Start a thread to monitor the messages
+        self._running = True
+        self._stopping = False
+        self._monitor_thread = Thread(target=self._process_messages, daemon=True)
         self._monitor_thread.start()
 
     def stop_tests(self):
         """
-        Stop the running tests by terminating the process.
-        """
-        if self._running_process and self._running_process.is_alive():
-            self._running_process.terminate()
-            self._running_process.join()
-        if self._monitor_thread and self._monitor_thread.is_alive():
-            self._monitor_thread.join()
+        Stop the running tests by terminating the worker process and the processes started by the tests, like
+        the pytest-xdist workers. A new worker process is started by the next test run.
 
-        self.callback({'timestamp': datetime.now(timezone.utc).isoformat(), 'reason': 'cancelled'})
+        The monitor thread waits for the worker process to exit and passes the cancelled message to the
+        callback, once it has handled the remaining messages. It isn't joined here, because it may be
+        waiting for the event loop this is called from to handle those messages.
+        """
+        with self._worker_lock:
+            if self._running:
+                self._stopping = True
+                _terminate_worker_process(self._worker_process)
+                return
+        self._invoke_callback({'ts_ns': time.time_ns(), 'reason': 'cancelled'})
@@ -1,47 +1,107 @@
+import json
+
 from .pytest_runner import PytestRunner
-from collections import defaultdict
+from datetime import datetime, timezone
 from nicegui import ui
 from typing import Callable
 
 
+def format_timestamp(message: dict) -> str:
+    """
+    Format the time.time_ns() timestamp of a PytestRunner message as an ISO 8601 string.
+    """
+    return datetime.fromtimestamp(message['ts_ns'] / 1e9, tz=timezone.utc).isoformat()
+
+
 class PytestUI():
-    def __init__(self, stepper, test_path, callback: Callable[[dict], None]):
+    def __init__(self, stepper, test_path, callback: Callable[[dict], None], parallel: int = 0):
         self.stepper = stepper
         self.test_path = test_path
         self.callback = callback
 
-        self.pytest_runner = PytestRunner(self.test_callback)
-        test_cases = self.pytest_runner.discover_tests(self.test_path)
+        self.pytest_runner = PytestRunner(self.test_callback, parallel=parallel)
+        # Parsing the test files is enough for the tree, only fall back on pytest when that finds nothing
+        test_cases = self.pytest_runner.discover_tests_fast(self.test_path) or self.pytest_runner.discover_tests(self.test_path)
 
-        grouped_tests = defaultdict(list)
+        # Group the test cases per module, the module nodes are added to the tree list when first seen
+        module_nodes = {}
         for test_case in test_cases:
-            test_case_fields = test_case.split('.py::')
-            module_name = test_case_fields[0]
-            test_name = test_case_fields[1]
-            grouped_tests[module_name].append({'id': f'{module_name}.py::{test_name}', 'label': test_name})
-
-        self.test_cases_tree_list = [{'id': 'test_cases', 'label': 'test cases',
-                                      'children': [{'id': module, 'label': module, 'children': children} for module, children in grouped_tests.items()]}]
+            module_name, separator, test_name = test_case.partition('.py::')
+            if not separator:
+                continue  # Not a test in a python module
+            if module_name not in module_nodes:
+                module_nodes[module_name] = {'id': module_name, 'label': module_name, 'children': []}
+            module_nodes[module_name]['children'].append({'id': test_case, 'label': test_name})
+
+        self.test_cases_tree_list = [{'id': 'test_cases', 'label': 'test cases', 'children': list(module_nodes.values())}]
+        # Full paths of the test cases as passed to pytest, so they don't need to be built on each execution
+        self.test_case_paths = {test_case: str(self.test_path / test_case) for test_case in test_cases}
+        # The test cases by the resolved paths the runner reports them with, which don't depend on pytest's rootdir
+        self.test_case_ids = {}
+        for test_case in test_cases:
+            test_file, separator, test_name = test_case.partition('::')
+            self.test_case_ids[f'{(self.test_path / test_file).resolve()}{separator}{test_name}'] = test_case
 
         self.ui_elements()
 
     def test_callback(self, message: dict):
         if message.get('reason') == 'running':
-            print(f"{message['timestamp']}: Running test {message['current_index']}/{message['total_tests']}: {message['test_name']}")
+            print(f"{format_timestamp(message)}: Running test {message['current_index']}/{message['total_tests']}: {message['test_name']}")
         elif message.get('reason') == 'completed':
-            print(f"{message['timestamp']}: Test {message['test_name']} finished with result: {message}")
-            self.test_results_table.rows[self.test_index]['result'] = message['outcome']
-            self.test_results_table.update()
-            print(self.test_index, self.test_total)
-            self.test_index += 1
-            if self.test_index == self.test_total:
-                self.done_button.enable()
+            print(f"{format_timestamp(message)}: Test {message['test_name']} finished with result: {message}")
+            # Tests finish out of order when run in parallel, so look up their row
+            row_index = self.find_test_row(message['test_path'])
+            if row_index is not None:
+                row = self.test_results_table.rows[row_index]
+                # A parametrized test has a single row, which keeps a failure of any of its parameters
+                if row['result'] != 'failed':
+                    row['result'] = message['outcome']
+                    self.update_result_cell(row_index)
+        elif message.get('reason') == 'finished':
+            print(f"{format_timestamp(message)}: Test run finished.")
+            self.test_results_table.update()  # Make sure the browser ends up in sync with all the results
+            self.done_button.enable()
         elif message.get('reason') == 'error':
-            print(f"{message['timestamp']}: Error: {message['stderror']}")
+            print(f"{format_timestamp(message)}: Error: {message['stderror']}")
+            # The test run has ended as well, so don't leave Cancel/Back as the only way out
+            self.test_results_table.update()
+            self.done_button.enable()
         elif message.get('reason') == 'cancelled':
-            print(f"{message['timestamp']}: Test run was cancelled.")
+            print(f"{format_timestamp(message)}: Test run was cancelled.")
         elif message.get('reason') == 'log':
-            print(f"{message['timestamp']}: {message['stdout']}")
+            print(f"{format_timestamp(message)}: {message['stdout']}")
+
+    def find_test_row(self, test_path: str):
+        """
+        Find the row of the results table for a test reported by the runner.
+
+        Args:
+            test_path (str): The test's resolved path as reported by the runner.
+
+        Returns:
+            int: Index of the row, None when the test isn't in the table.
+        """
+        test_case = self.test_case_ids.get(test_path)
+        if test_case is None:
+            # Parametrized tests are reported per parameter, e.g. test_name[1], but may be in the tree once
+            test_file, separator, test_name = test_path.partition('::')
+            test_case = self.test_case_ids.get(f"{test_file}{separator}{test_name.split('[', 1)[0]}")
+        return self.test_row_indices.get(test_case)
+
+    def update_result_cell(self, row_index: int):
+        """
+        Update the result of a row of the results table in the browser, instead of sending all the rows with update().
+
+        NiceGUI has no API for this, so the row is patched in the element data of its Vue app, as laid out in
+        NiceGUI 2.8.1, the version pinned by the gui extra. Check this still works when upgrading NiceGUI, the
+        update() at the end of the test run brings the table in sync in any case.
+
+        Args:
+            row_index (int): Index of the row in the results table.
+        """
+        result = json.dumps(self.test_results_table.rows[row_index]['result'])
+        self.test_results_table.client.run_javascript(
+            f'mounted_app.elements[{self.test_results_table.id}].props.rows[{row_index}].result = {result}')
 
     def execute_tests(self):
         """
@@ -57,7 +117,6 @@ class PytestUI():
 
         # Filter only valid test cases (not folders or non-test items)
         selected_test_cases = [test_case for test_case in selected_test_cases if "::" in test_case]
-        self.test_total = len(selected_test_cases)
 
         if not selected_test_cases:
             print("No test cases selected.")
@@ -66,13 +125,13 @@ class PytestUI():
         # Prepare rows for the results table
         rows = [{'test_case': test_case, 'result': '-'} for test_case in selected_test_cases]
         self.test_results_table.rows = rows
+        self.test_row_indices = {test_case: index for index, test_case in enumerate(selected_test_cases)}
 
         # Reset test execution state
-        self.test_index = 0
         self.end_result = 'Passed'
 
         # Start the tests
-        self.pytest_runner.start_tests([str(self.test_path / x) for x in selected_test_cases])
+        self.pytest_runner.start_tests([self.test_case_paths[x] for x in selected_test_cases])
 
     def cancel_back(self):
         self.pytest_runner.stop_tests()
@@ -92,7 +151,7 @@ class PytestUI():
                 {'name': 'test_case', 'label': 'Test case', 'field': 'test_case', 'required': True, 'align': 'left'},
                 {'name': 'result', 'label': 'Result', 'field': 'result', 'sortable': True},
             ]
-            self.test_results_table = ui.table(columns=columns, rows=[], row_key='name')
+            self.test_results_table = ui.table(columns=columns, rows=[], row_key='test_case')
             self.test_results_log = ui.log().classes('max-w-full h-40')
 
             with ui.stepper_navigation():